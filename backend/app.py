@@ -1,25 +1,77 @@
 # backend/app.py
-from flask import Flask, jsonify, request, render_template_string
+from flask import Flask, Response, jsonify, request, render_template_string, stream_with_context
 from model import InsiderThreatModel
 from flask_cors import CORS
-import joblib
-import os
+from flask_compress import Compress
+import hashlib
+import threading
+import weakref
+from waitress import serve
+import pandas as pd
+import orjson
 
 app = Flask(__name__)
 CORS(app)
+Compress(app)
 
-MODEL_PATH = "model/insider_iforest.pkl"
+MODEL_DIR = "model"
+RAW_ROW_LIMIT = 200  # most recent rows per source returned by /user/raw
 
 # -------------------- Initialize or Load Model --------------------
-if os.path.exists(MODEL_PATH):
-    print(f"🔹 Loading existing model from {MODEL_PATH}")
-    model = joblib.load(MODEL_PATH)
+def build_model():
+    """Load the CSVs and train a new model; the one being served is never touched"""
+    fresh = InsiderThreatModel(contamination=0.03, model_dir=MODEL_DIR)
+    fresh.load_data("data")   # expects data/logon.csv, device.csv, email.csv, file.csv
+    fresh.train(save=True)
+    return fresh
+
+if InsiderThreatModel.is_saved(MODEL_DIR):
+    print(f"🔹 Loading existing model from {MODEL_DIR}")
+    model = InsiderThreatModel.load(MODEL_DIR)
 else:
     print("⚡ No saved model found, training new model...")
-    model = InsiderThreatModel(contamination=0.03)
-    model.load_data("data")   # expects data/logon.csv, device.csv, email.csv, file.csv
-    model.train(save=True)
-    print(f"✅ Model trained and saved to {MODEL_PATH}")
+    model = build_model()
+
+# /refresh swaps `model` for a fully trained replacement under this lock, which
+# also serializes concurrent refreshes. Views read `model` once per request and
+# never see a half-built model.
+refresh_lock = threading.Lock()
+
+# -------------------- JSON Helpers --------------------
+
+def dump_json(payload):
+    """Serialize with orjson; NumPy values natively, anything else (e.g. Timestamps) via str"""
+    return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY, default=str)
+
+def json_response(payload):
+    return Response(dump_json(payload), mimetype="application/json")
+
+# Serialized /risky_users payloads per model; they go away with the model they were built from
+risky_users_cache = weakref.WeakKeyDictionary()
+
+def risky_users_json(m, top_n):
+    """Serialized /risky_users payload for model `m`, memoized per top_n"""
+    cache = risky_users_cache.setdefault(m, {})
+    body = cache.get(top_n)
+    if body is None:
+        body = dump_json(m.get_risky_users(top_n=top_n))
+        if len(cache) < 64:
+            cache[top_n] = body
+    return body
+
+def not_modified(etag):
+    """Return a 304 response if the client already holds `etag`, else None.
+
+    flask_compress rewrites the ETag of a compressed body to '<etag>:<encoding>',
+    so those variants match too. Checking before the body is built is what lets
+    unchanged polls skip the work.
+    """
+    for tag in request.if_none_match.as_set():
+        if tag == etag or tag.rsplit(":", 1)[0] == etag:
+            resp = Response(status=304)
+            resp.set_etag(tag)
+            return resp
+    return None
 
 # -------------------- API Endpoints --------------------
 
@@ -27,7 +79,15 @@ else:
 def risky_users():
     """Return top risky users as JSON"""
     top_n = int(request.args.get("top_n", 20))
-    return jsonify(model.get_risky_users(top_n=top_n))
+    m = model
+    etag = f"{m.version}-{top_n}"
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
+    resp = Response(risky_users_json(m, top_n), mimetype="application/json")
+    resp.set_etag(etag)
+    return resp
 
 @app.route("/risky_users/table", methods=["GET"])
 def risky_users_table():
@@ -37,11 +97,7 @@ def risky_users_table():
     if not records:
         return "<h3>No data available</h3>"
 
-    table_html = "<table border='1' style='border-collapse:collapse;padding:6px;'>"
-    table_html += "<tr>" + "".join(f"<th>{col}</th>" for col in records[0].keys()) + "</tr>"
-    for row in records:
-        table_html += "<tr>" + "".join(f"<td>{row[col]}</td>" for col in row.keys()) + "</tr>"
-    table_html += "</table>"
+    table_html = pd.DataFrame(records).to_html(index=False, border=1)
 
     return render_template_string("""
     <html>
@@ -49,7 +105,7 @@ def risky_users_table():
         <title>Risky Users</title>
         <style>
           body { font-family: Arial, sans-serif; padding: 20px; }
-          table { border: 1px solid #ccc; width: 100%; }
+          table { border: 1px solid #ccc; border-collapse: collapse; width: 100%; }
           th { background: #f2f2f2; text-align: left; padding: 6px; }
           td { padding: 6px; }
         </style>
@@ -72,7 +128,7 @@ def user_features():
 
     try:
         feats = model.get_user_features(user)
-        return jsonify(feats)
+        return json_response(feats)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -82,27 +138,61 @@ def user_raw():
     if not user:
         return jsonify({"error": "pass user param"}), 400
 
-    if not hasattr(model, "get_user_raw"):
-        return jsonify({"error": "Model method get_user_raw missing"}), 500
+    m = model
+    if not hasattr(m, "iter_user_raw"):
+        return jsonify({"error": "Model method iter_user_raw missing"}), 500
+
+    # Hash the user so quotes or non-latin-1 names can't break the ETag header
+    etag = f"{m.version}-{hashlib.sha1(user.encode('utf-8')).hexdigest()}"
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
 
+    # Build the first source before committing to a 200, so failures there still get a 500
+    sources = m.iter_user_raw(user, limit=RAW_ROW_LIMIT)
     try:
-        raw = model.get_user_raw(user)
-        return jsonify(raw)
+        first = next(sources, None)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+    def generate():
+        # Stream {"src": [...], ...} one source at a time
+        yield b"{"
+        if first is None:
+            yield b"}"
+            return
+        yield dump_json(first[0]) + b":" + dump_json(first[1])
+        try:
+            for src, rows in sources:
+                yield b"," + dump_json(src) + b":" + dump_json(rows)
+        except Exception as e:
+            # The status is already sent; keep the body valid JSON and report the error in it
+            yield b',"error":' + dump_json(str(e))
+        yield b"}"
+
+    resp = Response(stream_with_context(generate()), mimetype="application/json")
+    resp.set_etag(etag)
+    # True per-source totals, so clients can tell when RAW_ROW_LIMIT truncated a list
+    resp.headers["X-Total-Rows"] = dump_json(m.user_row_counts(user)).decode()
+    return resp
+
+@app.route("/version", methods=["GET"])
+def version():
+    """Return the current model version; changes on every retrain"""
+    return jsonify({"version": model.version})
+
 @app.route("/refresh", methods=["POST"])
 def refresh():
+    global model
     try:
         print("♻ Refreshing model...")
-        model.load_data("data")
-        model.train(save=True)
-        joblib.dump(model, MODEL_PATH)
-        print(f"✅ Model refreshed and saved to {MODEL_PATH}")
+        with refresh_lock:
+            model = build_model()
+        print(f"✅ Model refreshed and saved to {MODEL_DIR}")
         return jsonify({"status": "ok"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 # -------------------- Run App --------------------
 if __name__ == "__main__":
-    app.run(debug=False, use_reloader=False)
+    serve(app, host="127.0.0.1", port=5000, threads=8)
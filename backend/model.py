@@ -1,14 +1,49 @@
 import pandas as pd
 import numpy as np
-import networkx as nx
+import pyarrow as pa
+from pyarrow import csv as pa_csv
 from sklearn.ensemble import IsolationForest
-from sklearn.preprocessing import StandardScaler
 import os
+import re
+import uuid
 import joblib
 
+ESTIMATOR_FILE = "iforest.pkl"
+FEATURES_FILE = "features.parquet"
+RAW_SOURCES = ["logon", "device", "email", "file"]
+_EMPTY_IDX = np.array([], dtype=np.intp)
+# Raw log -> per-day count column served by get_user_features
+DAILY_COLUMNS = {"logon": "logons", "file": "files", "device": "usb", "email": "emails"}
+# Columns kept from each raw log: user/timestamp aliases plus what the features and
+# /user/raw use. Bulky free text (e.g. CERT's email/file "content") is never loaded.
+_BASE_COLS = ["user", "employee", "user_id", "actor", "timestamp", "date", "time", "sent_time", "pc"]
+USECOLS = {
+    "logon": _BASE_COLS + ["activity"],
+    "device": _BASE_COLS + ["activity"],
+    "email": _BASE_COLS + ["recipient", "to", "cc", "bcc", "from", "subject", "size", "attachments"],
+    "file": _BASE_COLS + ["filename"],
+}
+_KEYWORD_RE = re.compile(r"confidential|secret|password", re.IGNORECASE)
+
+def _as_key(values):
+    """Cast an id column to str, keeping nulls missing and integral floats (ints with blanks) free of '.0'"""
+    if pd.api.types.is_float_dtype(values) and (values.dropna() % 1 == 0).all():
+        values = values.astype("Int64")
+    keys = values.astype("string")
+    return keys.astype(object).where(keys.notna(), np.nan)
+
+def _parquet_ready(df, keep=("user",)):
+    """Stringify object columns that mix value types (e.g. int and str), which Arrow refuses to write"""
+    mixed = [col for col in df.columns
+             if col not in keep and df[col].dtype == object
+             and pd.api.types.infer_dtype(df[col], skipna=True).startswith("mixed")]
+    if not mixed:
+        return df
+    return df.assign(**{col: df[col].where(df[col].isna(), df[col].astype(str)) for col in mixed})
+
 class InsiderThreatModel:
-    def __init__(self, contamination=0.03, model_path="model/insider_iforest.pkl"):
-        self.model_path = model_path
+    def __init__(self, contamination=0.03, model_dir="model"):
+        self.model_dir = model_dir
         # Smaller model for fast training
         self.model = IsolationForest(
             n_estimators=50,
@@ -19,24 +54,138 @@ class InsiderThreatModel:
         )
         self.features_df = None
         self.raw_logs = {}
-
-        # Try to load existing saved model
-        if os.path.exists(self.model_path):
-            try:
-                loaded = joblib.load(self.model_path)
-                self.__dict__.update(loaded.__dict__)
-                print(f"✅ Loaded existing model from '{self.model_path}'")
-            except Exception as e:
-                print(f"❌ Failed to load model: {e}")
+        self._idx = {}
+        self._user_daily = None
+        self._ranked_cache = None
+        # Changes whenever features/scores change; used for HTTP ETags
+        self.version = uuid.uuid4().hex
+
+    @staticmethod
+    def is_saved(model_dir="model"):
+        """True if model_dir holds a model written by save()"""
+        return (os.path.exists(os.path.join(model_dir, ESTIMATOR_FILE))
+                and os.path.exists(os.path.join(model_dir, FEATURES_FILE)))
+
+    @classmethod
+    def load(cls, model_dir="model"):
+        """Restore a saved model: estimator via joblib, DataFrames via Parquet"""
+        obj = cls(model_dir=model_dir)
+        obj.model = joblib.load(os.path.join(model_dir, ESTIMATOR_FILE))
+        obj.features_df = pd.read_parquet(os.path.join(model_dir, FEATURES_FILE))
+
+        for src in RAW_SOURCES:
+            path = os.path.join(model_dir, f"raw_{src}.parquet")
+            obj.raw_logs[src] = pd.read_parquet(path) if os.path.exists(path) else pd.DataFrame()
+        obj.logon = obj.raw_logs["logon"]
+        obj.device = obj.raw_logs["device"]
+        obj.email = obj.raw_logs["email"]
+        obj.file = obj.raw_logs["file"]
+        obj._idx = cls._index_raw_logs(obj.raw_logs)
+        obj._user_daily = cls._build_user_daily(obj.raw_logs)
+
+        print(f"✅ Loaded existing model from '{model_dir}'")
+        return obj
+
+    def save(self):
+        """Persist the estimator with joblib and features/raw logs as Parquet"""
+        os.makedirs(self.model_dir, exist_ok=True)
+        joblib.dump(self.model, os.path.join(self.model_dir, ESTIMATOR_FILE), compress=3)
+        _parquet_ready(self.features_df).to_parquet(os.path.join(self.model_dir, FEATURES_FILE))
+        for src, df in self.raw_logs.items():
+            path = os.path.join(self.model_dir, f"raw_{src}.parquet")
+            if df.empty:
+                if os.path.exists(path):
+                    os.remove(path)
+                continue
+            _parquet_ready(df).to_parquet(path)
+
+    @staticmethod
+    def _index_raw_logs(raw_logs):
+        """Map each source to (frame, {user: row positions}) for O(1) per-user lookups.
+
+        The frame travels with its positions so a reader can never apply one
+        frame's positions to another frame swapped in by a concurrent refresh.
+        """
+        return {
+            src: (df, df.groupby('user').indices if not df.empty and 'user' in df.columns else {})
+            for src, df in raw_logs.items()
+        }
+
+    @staticmethod
+    def _build_user_daily(raw_logs):
+        """Precompute per-(user, date) event counts for every source in one long-form groupby"""
+        parts = []
+        for src, col in DAILY_COLUMNS.items():
+            df = raw_logs.get(src)
+            if df is None or df.empty or 'user' not in df.columns or 'date' not in df.columns:
+                continue
+            parts.append(df[['user', 'date']].assign(src=col))
+
+        if parts:
+            daily = (pd.concat(parts, ignore_index=True)
+                     .groupby(['user', 'date', 'src']).size()
+                     .unstack('src', fill_value=0))
+            daily.columns.name = None
         else:
-            print(f"⚠️ No saved model found at '{self.model_path}'. Train before using predictions.")
-
-    def _read_csv(self, path, nrows=None):
-        """Read CSV and normalize timestamp column"""
+            daily = pd.DataFrame(index=pd.MultiIndex.from_arrays([[], []], names=['user', 'date']))
+        return daily.reindex(columns=list(DAILY_COLUMNS.values()), fill_value=0)
+
+    @staticmethod
+    def _user_rows(df, positions, user, limit=None):
+        """Rows of `df` belonging to `user`, optionally only the `limit` most recent"""
+        idx = positions.get(user, _EMPTY_IDX)
+        if limit is not None and len(idx) > limit:
+            if 'timestamp' in df.columns:
+                ts = df['timestamp'].to_numpy()[idx]
+                idx = idx[np.argsort(ts, kind='stable')]
+            idx = idx[-limit:]
+        return df.take(idx)
+
+    def _read_csv_arrow(self, path, nrows=None, usecols=None):
+        """Stream CSV record batches with pyarrow, stopping once nrows are read"""
+        # strings_can_be_null makes empty fields NaN like pd.read_csv, not ""
+        convert_options = pa_csv.ConvertOptions(include_columns=usecols or [], strings_can_be_null=True)
+        with pa_csv.open_csv(path, convert_options=convert_options) as reader:
+            batches, seen = [], 0
+            for batch in reader:
+                batches.append(batch)
+                seen += batch.num_rows
+                if nrows is not None and seen >= nrows:
+                    break
+            table = pa.Table.from_batches(batches, schema=reader.schema)
+        if nrows is not None:
+            table = table.slice(0, nrows)
+        return table.to_pandas()
+
+    def _parse_timestamps(self, values):
+        """Parse with a locked format first; only fall back to per-row parsing if nothing parses"""
+        # ISO8601, then the format inferred from the first row (e.g. CERT's
+        # "%m/%d/%Y %H:%M:%S"), then dateutil-style "mixed" as a last resort
+        for fmt in ("ISO8601", None, "mixed"):
+            try:
+                ts = pd.to_datetime(values, errors='coerce', format=fmt, cache=True)
+            except ValueError:
+                continue
+            if ts.notna().any() or values.isna().all():
+                return ts
+        return pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+
+    def _read_csv(self, path, nrows=None, usecols=None):
+        """Read CSV (only the `usecols` it actually has) and normalize timestamp column"""
         if not os.path.exists(path):
             return pd.DataFrame()
+
+        if usecols is not None:
+            header = pd.read_csv(path, nrows=0).columns
+            usecols = [col for col in header if col in usecols] or None
         
-        df = pd.read_csv(path, nrows=nrows)
+        try:
+            df = self._read_csv_arrow(path, nrows=nrows, usecols=usecols)
+        except pa.ArrowException as e:
+            # Column types drifting between blocks trips Arrow's inference
+            print(f"⚠️ Arrow CSV reader failed for '{path}' ({e}), using pandas")
+            # low_memory=False infers each column's type in one pass, so no int/str chunk mixes
+            df = pd.read_csv(path, nrows=nrows, usecols=usecols, low_memory=False)
         
         # Look for timestamp/date/time columns
         timestamp_col = None
@@ -46,45 +195,55 @@ class InsiderThreatModel:
                 break
         
         if timestamp_col:
-            df['timestamp'] = pd.to_datetime(df[timestamp_col], errors='coerce')
+            df['timestamp'] = self._parse_timestamps(df[timestamp_col])
         else:
             # If no timestamp/date column exists, create a dummy timestamp
             df['timestamp'] = pd.Timestamp('2000-01-01')  # arbitrary default
         
-        # Ensure a date column exists for daily aggregation
-        df['date'] = df['timestamp'].dt.date
+        # Ensure a date column exists for daily aggregation (datetime64[D], not Python dates)
+        df['date'] = df['timestamp'].values.astype('datetime64[D]')
         
         return df
 
 
     def load_data(self, data_folder="data", max_rows=50000):
         # Load raw CSVs (downsample for speed)
-        self.logon = self._read_csv(f"{data_folder}/logon.csv", nrows=max_rows)
-        self.device = self._read_csv(f"{data_folder}/device.csv", nrows=max_rows)
-        self.email = self._read_csv(f"{data_folder}/email.csv", nrows=max_rows)
-        self.file = self._read_csv(f"{data_folder}/file.csv", nrows=max_rows)
+        logon_df = self._read_csv(f"{data_folder}/logon.csv", nrows=max_rows, usecols=USECOLS["logon"])
+        device_df = self._read_csv(f"{data_folder}/device.csv", nrows=max_rows, usecols=USECOLS["device"])
+        email_df = self._read_csv(f"{data_folder}/email.csv", nrows=max_rows, usecols=USECOLS["email"])
+        file_df = self._read_csv(f"{data_folder}/file.csv", nrows=max_rows, usecols=USECOLS["file"])
 
         # Normalize "user" column naming
-        for df in [self.logon, self.device, self.email, self.file]:
+        for df in [logon_df, device_df, email_df, file_df]:
             for alt in ["employee", "user_id", "actor"]:
                 if "user" not in df.columns and alt in df.columns:
                     df.rename(columns={alt: "user"}, inplace=True)
 
         # Normalize email recipient columns
-        if "recipient" not in self.email.columns:
+        if "recipient" not in email_df.columns:
             for col in ["to", "cc", "bcc"]:
-                if col in self.email.columns:
-                    self.email.rename(columns={col: "recipient"}, inplace=True)
+                if col in email_df.columns:
+                    email_df.rename(columns={col: "recipient"}, inplace=True)
                     break
-        if "recipient" not in self.email.columns:
-            self.email["recipient"] = "unknown"
+        if "recipient" not in email_df.columns:
+            email_df["recipient"] = "unknown"
 
-        self.raw_logs = {"logon": self.logon, "device": self.device, "email": self.email, "file": self.file}
+        # One key type everywhere: numeric sender ids next to address-string recipients
+        # would otherwise mix in the user column, which Parquet cannot store
+        for df in [logon_df, device_df, email_df, file_df]:
+            if "user" in df.columns:
+                df["user"] = _as_key(df["user"])
+        email_df["recipient"] = _as_key(email_df["recipient"])
+
+        raw_logs = {"logon": logon_df, "device": device_df, "email": email_df, "file": file_df}
+        idx = self._index_raw_logs(raw_logs)
+        user_daily = self._build_user_daily(raw_logs)
 
         # ----------- Temporal Features -----------
-        if not self.logon.empty and "timestamp" in self.logon.columns:
-            self.logon["hour"] = self.logon["timestamp"].dt.hour
-            login_feats = self.logon.groupby("user").agg(
+        if not logon_df.empty and "timestamp" in logon_df.columns:
+            hours = logon_df["timestamp"].dt.hour.to_numpy()
+            logon_df["hour"] = hours
+            login_feats = logon_df.groupby("user").agg(
                 mean_login_hour=("hour", "mean"),
                 mean_logout_hour=("hour", "max")
             ).reset_index()
@@ -92,63 +251,87 @@ class InsiderThreatModel:
             login_feats = pd.DataFrame(columns=["user", "mean_login_hour", "mean_logout_hour"])
 
         # ----------- Usage Counts -----------
-        file_feats = self.file.groupby("user").agg(files_per_day=("timestamp", "count")).reset_index() if not self.file.empty else pd.DataFrame(columns=["user", "files_per_day"])
-        usb_feats = self.device.groupby("user").agg(usb_per_day=("timestamp", "count")).reset_index() if not self.device.empty else pd.DataFrame(columns=["user", "usb_per_day"])
-        email_feats = self.email.groupby("user").agg(emails_per_day=("timestamp", "count")).reset_index() if not self.email.empty else pd.DataFrame(columns=["user", "emails_per_day"])
+        # One tagged concat + groupby instead of a groupby per source
+        usage_sources = {"files_per_day": file_df, "usb_per_day": device_df, "emails_per_day": email_df}
+        usage_rows = [df.loc[df["timestamp"].notna(), ["user"]].assign(_src=name)
+                      for name, df in usage_sources.items() if not df.empty]
+        if usage_rows:
+            usage_feats = (pd.concat(usage_rows, ignore_index=True)
+                           .groupby(["user", "_src"]).size()
+                           .unstack("_src", fill_value=0))
+        else:
+            usage_feats = pd.DataFrame(index=pd.Index([], name="user"))
+        usage_feats = usage_feats.reindex(columns=list(usage_sources), fill_value=0).reset_index()
+        usage_feats.columns.name = None
 
         # ----------- Out-of-session (after-hours) -----------
-        if not self.logon.empty and "hour" in self.logon.columns:
-            self.logon["after_hours"] = self.logon["hour"].isin(list(range(0,6)) + list(range(20,24))).astype(int)
-            out_session = self.logon.groupby("user").agg(out_of_session_access=("after_hours","sum")).reset_index()
+        if not logon_df.empty and "timestamp" in logon_df.columns:
+            logon_df["after_hours"] = ((hours < 6) | (hours >= 20)).view(np.int8)
+            out_session = logon_df.groupby("user").agg(out_of_session_access=("after_hours","sum")).reset_index()
         else:
             out_session = pd.DataFrame(columns=["user", "out_of_session_access"])
 
         # ----------- Graph Features (degree centrality only) -----------
-        if not self.email.empty:
-            G = nx.from_pandas_edgelist(self.email, "user", "recipient", create_using=nx.Graph())
+        if not email_df.empty:
+            # degree / (n - 1) on the undirected user-recipient graph; duplicate
+            # edges are dropped so each neighbour counts once, as in nx.Graph.
+            # Nodes are factorized (not stringified) so keys match the other fragments.
+            pairs = email_df[["user", "recipient"]].dropna()
+            codes, nodes = pd.factorize(pd.concat([pairs["user"], pairs["recipient"]], ignore_index=True))
+            senders, recipients = codes[:len(pairs)], codes[len(pairs):]
+            edges = pd.DataFrame({
+                "a": np.minimum(senders, recipients),
+                "b": np.maximum(senders, recipients)
+            }).drop_duplicates()
+            deg = pd.concat([edges["a"], edges["b"]]).value_counts()
             centrality = pd.DataFrame({
-                "user": list(G.nodes),
-                "degree_centrality": pd.Series(nx.degree_centrality(G)),
-                "betweenness_centrality": 0  # skip betweenness for speed
+                "user": np.asarray(nodes, dtype=object)[deg.index.to_numpy()],
+                "degree_centrality": deg.values / max(deg.size - 1, 1),
+                "betweenness_centrality": 0.0  # skip betweenness for speed
             })
         else:
             centrality = pd.DataFrame(columns=["user", "degree_centrality", "betweenness_centrality"])
 
         # ----------- Email Text Features -----------
-        if "subject" in self.email.columns:
-            self.email["subject_len"] = self.email["subject"].astype(str).str.len()
-            self.email["keyword_flag"] = self.email["subject"].str.contains(
-                "confidential|secret|password", case=False, na=False
-            ).astype(int)
-            self.email["sentiment"] = np.random.choice([0, 1], size=len(self.email))  # placeholder
-            text_feats = self.email.groupby("user").agg(
+        if "subject" in email_df.columns:
+            subject = email_df["subject"].astype(str)
+            email_df["subject_len"] = subject.str.len()
+            email_df["keyword_flag"] = subject.str.contains(_KEYWORD_RE, na=False).astype(int)
+            text_feats = email_df.groupby("user").agg(
                 subject_len=("subject_len", "mean"),
-                keyword_flag=("keyword_flag", "mean"),
-                sentiment=("sentiment", "mean")
+                keyword_flag=("keyword_flag", "mean")
             ).reset_index()
+            text_feats["sentiment"] = 0  # placeholder until a real sentiment model exists
         else:
-            text_feats = pd.DataFrame({"user": self.email["user"].unique() if not self.email.empty else [],
+            text_feats = pd.DataFrame({"user": email_df["user"].unique() if not email_df.empty else [],
                                        "subject_len": 0,
                                        "keyword_flag": 0,
                                        "sentiment": 0})
 
         # ----------- Merge All Features -----------
-        features = (login_feats.merge(file_feats, on="user", how="outer")
-                    .merge(usb_feats, on="user", how="outer")
-                    .merge(email_feats, on="user", how="outer")
-                    .merge(out_session, on="user", how="outer")
-                    .merge(centrality, on="user", how="outer")
-                    .merge(text_feats, on="user", how="outer")
-                    .fillna(0))
-
+        # Align every fragment on the union of users in one concat rather than chained merges
+        fragments = [login_feats, usage_feats, out_session, centrality, text_feats]
+        features = (pd.concat([f.set_index("user") for f in fragments], axis=1, join="outer", sort=True)
+                    .fillna(0)
+                    .rename_axis("user")
+                    .reset_index())
+
+        # Publish the new state together at the end; requests keep reading the old
+        # frames/indices while everything above is being rebuilt
+        self.logon, self.device, self.email, self.file = logon_df, device_df, email_df, file_df
+        self.raw_logs = raw_logs
+        self._idx = idx
+        self._user_daily = user_daily
         self.features_df = features
+        self._ranked_cache = None
         return features
 
     def train(self, save=True):
         if self.features_df is None:
             raise ValueError("No features. Run load_data() first.")
 
-        X = self.features_df.drop(columns=["user"]).astype(float).fillna(0)
+        # float32 is what sklearn's trees use internally, so this avoids a second copy
+        X = self.features_df.drop(columns=["user"]).astype(np.float32).fillna(0).to_numpy(np.float32, copy=False)
 
         # Train IsolationForest
         self.model.fit(X)
@@ -157,56 +340,53 @@ class InsiderThreatModel:
         if_scores = -self.model.decision_function(X)
 
         # Normalize scores
-        scaler = StandardScaler()
-        self.features_df["isolation_forest"] = scaler.fit_transform(if_scores.reshape(-1,1)).flatten()
+        mu = if_scores.mean()
+        sd = if_scores.std() or 1.0
+        self.features_df["isolation_forest"] = (if_scores - mu) / sd
 
         # Rank users
-        self.features_df["rank"] = self.features_df["isolation_forest"].rank(ascending=False).astype(int)
+        scores = self.features_df["isolation_forest"].to_numpy()
+        order = np.argsort(-scores, kind="stable")
+        ranks = np.empty_like(order)
+        ranks[order] = np.arange(1, len(order) + 1)
+        self.features_df["rank"] = ranks
+
+        # Pre-sort once; features only change on the next train()
+        self._cache_rankings()
+        self.version = uuid.uuid4().hex
 
         if save:
-            os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
-            joblib.dump(self, self.model_path)
-            print(f"✅ Model trained and saved to {self.model_path}")
+            self.save()
+            print(f"✅ Model trained and saved to '{self.model_dir}'")
 
         return self.features_df
 
+    def _cache_rankings(self):
+        """Materialize the ranked records list served by get_risky_users"""
+        # Order by the unique ranks from train(), so tied scores list in rank order too
+        ranked = self.features_df.sort_values("rank")
+        self._ranked_cache = ranked.to_dict(orient="records")
+
     def get_risky_users(self, top_n=20):
         if self.features_df is None:
             return []
-        ranked = self.features_df.sort_values("isolation_forest", ascending=False)
-        return ranked.head(top_n).to_dict(orient="records")
+        if self._ranked_cache is None:
+            if "isolation_forest" not in self.features_df.columns:
+                return []
+            self._cache_rankings()
+        return self._ranked_cache[:top_n]
     # Inside InsiderThreatModel class
 
     def get_user_features(self, user):
         """Return per-day aggregated features for a given user safely."""
-        if not self.raw_logs:
+        if not self.raw_logs or self._user_daily is None:
             return []
 
-        # Helper to compute per-day counts safely
-        def daily_count(df, col_name):
-            if df is None or df.empty or 'user' not in df.columns or 'date' not in df.columns:
-                return pd.DataFrame(columns=['date', col_name])
-            user_df = df[df['user'] == user]
-            if user_df.empty:
-                return pd.DataFrame(columns=['date', col_name])
-            counts = user_df.groupby('date')['user'].count().reset_index()
-            counts = counts.rename(columns={'user': col_name})
-            return counts
-
-        logon_counts = daily_count(self.logon, 'logons')
-        file_counts = daily_count(self.file, 'files')
-        usb_counts = daily_count(self.device, 'usb')
-        email_counts = daily_count(self.email, 'emails')
-
-        # Merge all per-day counts
-        from functools import reduce
-        dfs = [logon_counts, file_counts, usb_counts, email_counts]
-        merged = reduce(lambda left, right: pd.merge(left, right, on='date', how='outer'), dfs)
-        if merged.empty:
+        try:
+            merged = self._user_daily.xs(user, level='user').reset_index()
+        except KeyError:
             merged = pd.DataFrame({'date': [], 'logons': [], 'files': [], 'usb': [], 'emails': []})
 
-        merged = merged.fillna(0)
-
         # Add mean risk if available
         if self.features_df is not None and 'isolation_forest' in self.features_df.columns:
             user_row = self.features_df[self.features_df['user'] == user]
@@ -222,19 +402,27 @@ class InsiderThreatModel:
 
 
     
-    def get_user_raw(self, user):
-        """Return raw log data per user, organized by source."""
-        if not self.raw_logs:
-            return {}
-        
-        user_raw = {}
-        for src, df in self.raw_logs.items():
+    def iter_user_raw(self, user, limit=None):
+        """Yield (source, records) pairs of a user's raw logs, one source at a time."""
+        for src, (df, positions) in self._idx.items():
             if df.empty or 'user' not in df.columns:
-                user_raw[src] = []
-            else:
-                # Filter only this user and convert timestamp to string for JSON
-                temp = df[df['user'] == user].copy()
-                if 'timestamp' in temp.columns:
-                    temp['timestamp'] = temp['timestamp'].astype(str)
-                user_raw[src] = temp.to_dict(orient='records')
-        return user_raw
+                yield src, []
+                continue
+            # Gather this user's rows and format datetime columns in one vectorized cast for JSON
+            temp = self._user_rows(df, positions, user, limit=limit)
+            for col, unit in (('timestamp', 's'), ('date', 'D')):
+                if col in temp.columns:
+                    values = temp[col]
+                    if isinstance(values.dtype, pd.DatetimeTZDtype):
+                        # tz-aware columns give object arrays of Timestamps; format them as naive UTC
+                        values = values.dt.tz_convert(None)
+                    temp[col] = np.datetime_as_string(values.to_numpy(), unit=unit)
+            yield src, temp.to_dict(orient='records')
+
+    def user_row_counts(self, user):
+        """Total raw-log rows per source for a user, before any limit."""
+        return {src: len(positions.get(user, _EMPTY_IDX)) for src, (df, positions) in self._idx.items()}
+
+    def get_user_raw(self, user, limit=None):
+        """Return raw log data per user, organized by source (at most `limit` most recent rows each)."""
+        return dict(self.iter_user_raw(user, limit=limit))
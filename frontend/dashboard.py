@@ -2,11 +2,43 @@
 import streamlit as st
 import pandas as pd
 import requests
+import json
 import plotly.express as px
 
 API = "http://127.0.0.1:5000"
 
 st.set_page_config(layout="wide")
+
+# ---------------- Cached API calls ----------------
+# Keyed on the backend model version, so a retrain invalidates them immediately
+def get_version():
+    r = requests.get(f"{API}/version")
+    r.raise_for_status()
+    return r.json()["version"]
+
+@st.cache_data(ttl=60)
+def get_risky(version):
+    r = requests.get(f"{API}/risky_users")
+    r.raise_for_status()
+    return r.json()
+
+@st.cache_data(ttl=60)
+def get_user_features(version, user):
+    r = requests.get(f"{API}/user/features", params={"user": user})
+    r.raise_for_status()  # errors raise instead of being cached
+    return r.json()
+
+@st.cache_data(ttl=60)
+def get_user_raw(version, user):
+    r = requests.get(f"{API}/user/raw", params={"user": user})
+    r.raise_for_status()  # errors raise instead of being cached
+    raw = r.json()
+    if "error" in raw:  # failure after the backend had started streaming
+        raise RuntimeError(raw["error"])
+    # Backend caps rows per source; the header carries each source's true total
+    totals = json.loads(r.headers.get("X-Total-Rows", "{}"))
+    return raw, totals
+
 st.title("🔍 Insider Threat Detection — Multi-source Dashboard")
 
 # Sidebar Navigation
@@ -28,9 +60,8 @@ if st.sidebar.button("🔄 Refresh model (reload CSVs & retrain)"):
 
 # ---------------- Fetch risky users ----------------
 try:
-    r = requests.get(f"{API}/risky_users")
-    r.raise_for_status()
-    risky_list = r.json()
+    version = get_version()
+    risky_list = get_risky(version)
 except Exception as e:
     st.error("❌ Could not reach backend. Make sure backend is running (`python backend/app.py`).")
     st.stop()
@@ -97,7 +128,11 @@ elif page == "📈 User Features":
     else:
         user = st.selectbox("Select User to inspect", options=risky_df['User'].tolist())
         if user:
-            f = requests.get(f"{API}/user/features", params={"user": user}).json()
+            try:
+                f = get_user_features(version, user)
+            except Exception as e:
+                st.error(f"❌ Could not load features for {user}.")
+                st.stop()
             if isinstance(f, list) and len(f) > 0 and isinstance(f[0], dict):
                 feats = pd.DataFrame(f)
             else:
@@ -139,11 +174,20 @@ elif page == "🗂️ Raw Logs":
     else:
         user = st.selectbox("Select User to view logs", options=risky_df['User'].tolist())
         if user:
-            raw = requests.get(f"{API}/user/raw", params={"user": user}).json()
+            try:
+                raw, totals = get_user_raw(version, user)
+            except Exception as e:
+                st.error(f"❌ Could not load raw logs for {user}.")
+                st.stop()
             if isinstance(raw, dict):
                 st.subheader(f"📜 Raw logs for {user}")
                 for src, rows in raw.items():
-                    with st.expander(f"{src.upper()} — {len(rows)} rows"):
+                    total = totals.get(src, len(rows))
+                    if total > len(rows):
+                        label = f"{src.upper()} — {len(rows)} most recent of {total} rows"
+                    else:
+                        label = f"{src.upper()} — {len(rows)} rows"
+                    with st.expander(label):
                         if len(rows) > 0:
                             df = pd.DataFrame(rows)
                             if 'timestamp' in df.columns: